@@ -1,10 +1,17 @@
 import os
 import logging
 from flask import Flask, render_template, request, send_file, jsonify, flash, redirect, url_for
+from flask_caching import Cache
 from data_generator import CRMDataGenerator
 from recommendations import AIRecommendations
+import pandas as pd
+import functools
 import io
+import uuid
 import zipfile
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -13,10 +20,136 @@ logging.basicConfig(level=logging.DEBUG)
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "hackathon-crm-dashboard-2024")
 
+# Generated datasets live in the cache rather than on the app; set CACHE_TYPE=RedisCache
+# (with CACHE_REDIS_URL) to share them across workers
+cache = Cache(app, config={
+    'CACHE_TYPE': os.environ.get('CACHE_TYPE', 'SimpleCache'),
+    'CACHE_REDIS_URL': os.environ.get('CACHE_REDIS_URL'),
+    'CACHE_DEFAULT_TIMEOUT': 1800
+})
+
 # Initialize data generator and AI recommendations
 data_generator = CRMDataGenerator()
 ai_recommendations = AIRecommendations()
 
+# Download filenames for each generated dataset
+CSV_FILENAMES = {
+    'customers': 'crm_customers.csv',
+    'deals': 'crm_deals.csv',
+    'feedback': 'customer_feedback.csv'
+}
+
+def parquet_filename(dataset):
+    """Download filename for a dataset's Parquet export"""
+    return CSV_FILENAMES[dataset].replace('.csv', '.parquet')
+
+# ZIP compression options for /download-all, as (compress_type, compresslevel)
+ZIP_COMPRESSION = {
+    'none': (zipfile.ZIP_STORED, None),
+    'fast': (zipfile.ZIP_DEFLATED, 1),
+    'best': (zipfile.ZIP_DEFLATED, 6)
+}
+ZIP_WRITE_BUFFER_SIZE = 64 * 1024
+
+def to_arrow(df):
+    """Convert a DataFrame to an Arrow table for export"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Dates are generated at day precision, so export them as plain dates like pandas' CSV does
+    return table.cast(pa.schema([
+        pa.field(field.name, pa.date32()) if pa.types.is_timestamp(field.type) else field
+        for field in table.schema
+    ]))
+
+def write_csv(df, output):
+    """Write a DataFrame as UTF-8 CSV bytes with Arrow's C++ writer"""
+    pacsv.write_csv(to_arrow(df), output)
+
+# Serialized downloads and recommendations are cached per dataset version; generate_data sets a new version
+def cached_per_version(func):
+    """Cache func(data, *args) in the app cache on (func name, args, data['version']).
+    
+    Entries share the cache's timeout, eviction and backend with generated_data. Routes pass in
+    the dataset they already fetched, so a miss never reads generated_data a second time.
+    """
+    @functools.wraps(func)
+    def wrapper(data, *args):
+        key = ':'.join([func.__name__, *map(str, args), data['version']])
+        result = cache.get(key)
+        if result is None:
+            result = func(data, *args)
+            cache.set(key, result)
+        return result
+    
+    return wrapper
+
+@cached_per_version
+def serialize_csv(data, dataset):
+    """Serialize one generated dataset to CSV bytes"""
+    csv_bytes = io.BytesIO()
+    write_csv(data[dataset], csv_bytes)
+    return csv_bytes.getvalue()
+
+@cached_per_version
+def serialize_parquet(data, dataset):
+    """Serialize one generated dataset to zstd-compressed Parquet bytes"""
+    parquet_bytes = io.BytesIO()
+    pq.write_table(to_arrow(data[dataset]), parquet_bytes, compression='zstd')
+    return parquet_bytes.getvalue()
+
+@cached_per_version
+def build_recommendations(data):
+    """Run the recommendation analyses over the generated datasets once per version"""
+    return ai_recommendations.generate_recommendations(
+        data['customers'], 
+        data['deals'], 
+        data['feedback']
+    )
+
+@cached_per_version
+def serialize_zip(data, compression):
+    """Bundle all generated datasets and the Tableau guide into ZIP bytes"""
+    compress_type, compresslevel = ZIP_COMPRESSION[compression]
+    
+    # Create ZIP file in memory
+    zip_buffer = io.BytesIO()
+    
+    with zipfile.ZipFile(zip_buffer, 'w', compress_type, compresslevel=compresslevel) as zip_file:
+        # Add CSVs, streamed straight into their zip entries through a large buffer
+        # so the compressor sees big chunks rather than one small write per row
+        for dataset, filename in CSV_FILENAMES.items():
+            with zip_file.open(filename, 'w') as entry, \
+                    io.BufferedWriter(entry, buffer_size=ZIP_WRITE_BUFFER_SIZE) as csv_file:
+                write_csv(data[dataset], csv_file)
+        
+        # Add Parquet copies; they are already compressed
+        for dataset in CSV_FILENAMES:
+            zip_file.writestr(parquet_filename(dataset), serialize_parquet(data, dataset),
+                              compress_type=zipfile.ZIP_STORED)
+        
+        # Add Tableau guide
+        tableau_guide = """# Tableau Integration Guide
+
+## Step 1: Import Data
+1. Open Tableau Desktop
+2. Connect to Text File
+3. Import all three CSV files:
+   - crm_customers.csv
+   - crm_deals.csv
+   - customer_feedback.csv
+
+## Step 2: Create Relationships
+1. Drag tables to relationship canvas
+2. Connect Customer_ID fields between tables
+3. Verify data relationships
+
+## Step 3: Build Dashboard
+See the web application for detailed instructions.
+"""
+        # The guide is tiny, so compressing it isn't worth the CPU
+        zip_file.writestr('tableau_integration_guide.txt', tableau_guide, compress_type=zipfile.ZIP_STORED)
+    
+    return zip_buffer.getvalue()
+
 @app.route('/')
 def index():
     """Main landing page with options to generate data and view guides"""
@@ -44,12 +177,13 @@ def generate_data():
         )
         
         # Store in session or cache for download
-        app.config['generated_data'] = {
+        cache.set('generated_data', {
             'customers': customers_df,
             'deals': deals_df,
             'feedback': feedback_df,
-            'stats': summary_stats
-        }
+            'stats': summary_stats,
+            'version': uuid.uuid4().hex  # Keys the serialized download caches
+        })
         
         flash(f'Successfully generated data for {num_customers} customers!', 'success')
         return redirect(url_for('dashboard'))
@@ -62,11 +196,10 @@ def generate_data():
 @app.route('/dashboard')
 def dashboard():
     """Display generated data preview and download options"""
-    if 'generated_data' not in app.config:
+    data = cache.get('generated_data')
+    if data is None:
         flash('No data generated yet. Please generate data first.', 'warning')
         return redirect(url_for('index'))
-    
-    data = app.config['generated_data']
     return render_template('dashboard.html', 
                          customers=data['customers'].head(10),
                          deals=data['deals'].head(10),
@@ -76,90 +209,55 @@ def dashboard():
 @app.route('/download-csv/<dataset>')
 def download_csv(dataset):
     """Download individual CSV files"""
-    if 'generated_data' not in app.config:
+    data = cache.get('generated_data')
+    if data is None:
         flash('No data available for download', 'error')
         return redirect(url_for('index'))
     
-    data = app.config['generated_data']
-    
-    if dataset == 'customers':
-        df = data['customers']
-        filename = 'crm_customers.csv'
-    elif dataset == 'deals':
-        df = data['deals']
-        filename = 'crm_deals.csv'
-    elif dataset == 'feedback':
-        df = data['feedback']
-        filename = 'customer_feedback.csv'
-    else:
+    if dataset not in CSV_FILENAMES:
         flash('Invalid dataset requested', 'error')
         return redirect(url_for('dashboard'))
     
-    # Create CSV in memory
-    output = io.StringIO()
-    df.to_csv(output, index=False)
-    output.seek(0)
-    
-    # Convert to bytes
-    csv_bytes = io.BytesIO()
-    csv_bytes.write(output.getvalue().encode('utf-8'))
-    csv_bytes.seek(0)
+    csv_bytes = io.BytesIO(serialize_csv(data, dataset))
     
     return send_file(csv_bytes, 
                      mimetype='text/csv',
                      as_attachment=True,
-                     download_name=filename)
+                     download_name=CSV_FILENAMES[dataset])
 
-@app.route('/download-all')
-def download_all():
-    """Download all CSV files as a ZIP"""
-    if 'generated_data' not in app.config:
+@app.route('/download-parquet/<dataset>')
+def download_parquet(dataset):
+    """Download individual Parquet files"""
+    data = cache.get('generated_data')
+    if data is None:
         flash('No data available for download', 'error')
         return redirect(url_for('index'))
     
-    data = app.config['generated_data']
+    if dataset not in CSV_FILENAMES:
+        flash('Invalid dataset requested', 'error')
+        return redirect(url_for('dashboard'))
     
-    # Create ZIP file in memory
-    zip_buffer = io.BytesIO()
+    parquet_bytes = io.BytesIO(serialize_parquet(data, dataset))
     
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # Add customers CSV
-        customers_csv = io.StringIO()
-        data['customers'].to_csv(customers_csv, index=False)
-        zip_file.writestr('crm_customers.csv', customers_csv.getvalue())
-        
-        # Add deals CSV
-        deals_csv = io.StringIO()
-        data['deals'].to_csv(deals_csv, index=False)
-        zip_file.writestr('crm_deals.csv', deals_csv.getvalue())
-        
-        # Add feedback CSV
-        feedback_csv = io.StringIO()
-        data['feedback'].to_csv(feedback_csv, index=False)
-        zip_file.writestr('customer_feedback.csv', feedback_csv.getvalue())
-        
-        # Add Tableau guide
-        tableau_guide = """# Tableau Integration Guide
-
-## Step 1: Import Data
-1. Open Tableau Desktop
-2. Connect to Text File
-3. Import all three CSV files:
-   - crm_customers.csv
-   - crm_deals.csv
-   - customer_feedback.csv
-
-## Step 2: Create Relationships
-1. Drag tables to relationship canvas
-2. Connect Customer_ID fields between tables
-3. Verify data relationships
+    return send_file(parquet_bytes,
+                     mimetype='application/octet-stream',
+                     as_attachment=True,
+                     download_name=parquet_filename(dataset))
 
-## Step 3: Build Dashboard
-See the web application for detailed instructions.
-"""
-        zip_file.writestr('tableau_integration_guide.txt', tableau_guide)
+@app.route('/download-all')
+def download_all():
+    """Download all CSV (and Parquet) files as a ZIP"""
+    data = cache.get('generated_data')
+    if data is None:
+        flash('No data available for download', 'error')
+        return redirect(url_for('index'))
+    
+    compression = request.args.get('compression', 'fast')
+    if compression not in ZIP_COMPRESSION:
+        flash('Invalid compression requested', 'error')
+        return redirect(url_for('dashboard'))
     
-    zip_buffer.seek(0)
+    zip_buffer = io.BytesIO(serialize_zip(data, compression))
     
     return send_file(zip_buffer,
                      mimetype='application/zip',
@@ -169,17 +267,10 @@ See the web application for detailed instructions.
 @app.route('/api/recommendations')
 def get_recommendations():
     """Get AI-powered recommendations based on generated data"""
-    if 'generated_data' not in app.config:
+    data = cache.get('generated_data')
+    if data is None:
         return jsonify({'error': 'No data available'}), 400
-    
-    data = app.config['generated_data']
-    recommendations = ai_recommendations.generate_recommendations(
-        data['customers'], 
-        data['deals'], 
-        data['feedback']
-    )
-    
-    return jsonify(recommendations)
+    return jsonify(build_recommendations(data))
 
 @app.route('/tableau-guide')
 def tableau_guide():
@@ -189,20 +280,17 @@ def tableau_guide():
 @app.route('/api/sample-data')
 def get_sample_data():
     """Get sample data for preview charts"""
-    if 'generated_data' not in app.config:
+    data = cache.get('generated_data')
+    if data is None:
         return jsonify({'error': 'No data available'}), 400
     
-    data = app.config['generated_data']
-    
     # Prepare data for charts
-    sentiment_by_region = data['feedback'].groupby('Region')['Sentiment_Score'].mean().to_dict()
+    sentiment_by_region = data['feedback'].groupby('Region', observed=True)['Sentiment_Score'].mean().to_dict()
     churn_risk_distribution = data['feedback']['Churn_Risk'].value_counts().to_dict()
     
-    # Sentiment trend over time (mock monthly data)
-    import pandas as pd
-    feedback_with_dates = data['feedback'].copy()
-    feedback_with_dates['Month'] = pd.date_range(start='2024-01-01', periods=len(feedback_with_dates), freq='D').strftime('%Y-%m')
-    sentiment_trend = feedback_with_dates.groupby('Month')['Sentiment_Score'].mean().to_dict()
+    # Sentiment trend over time, by the month each piece of feedback was given
+    months = pd.to_datetime(data['feedback']['Feedback_Date']).dt.to_period('M').astype(str)
+    sentiment_trend = data['feedback']['Sentiment_Score'].groupby(months).mean().to_dict()
     
     return jsonify({
         'sentiment_by_region': sentiment_by_region,
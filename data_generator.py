@@ -1,16 +1,85 @@
 import pandas as pd
 import numpy as np
 from faker import Faker
-import random
 from datetime import datetime, timedelta
+import copy
 import logging
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; sentiment scoring falls back to NumPy
+    njit = None
+
+# Feedback row count above which the JIT kernel beats its one-off compile cost
+NUMBA_MIN_ROWS = 100_000
+
+SENTIMENT_LABELS = np.array(['Positive', 'Neutral', 'Negative'])
+CHURN_RISKS = np.array(['Low', 'Medium', 'High'])
+
+if njit is not None:
+    # No fastmath: reassociation or reciprocal division would break bit-equality with the NumPy path
+    @njit(parallel=True, cache=True)
+    def _score_feedback_kernel(status_codes, segment_codes, sentiment_noise, risk_noise,
+                               out_scores, out_labels, out_risks):
+        """Fused sentiment and churn scoring; codes follow CRMDataGenerator._score_feedback"""
+        for i in prange(len(status_codes)):
+            status = status_codes[i]
+            segment = segment_codes[i]
+            
+            base_sentiment = 0.0
+            if status == 2:
+                base_sentiment -= 0.5
+            elif status == 1:
+                base_sentiment -= 0.2
+            if segment == 2:
+                base_sentiment -= 0.1
+            elif segment == 1:
+                base_sentiment += 0.1
+            
+            raw_score = min(1.0, max(-1.0, base_sentiment + sentiment_noise[i]))
+            # Same scale-and-rint rounding as ndarray.round(3); numba's scalar round(x, 3) differs by an ulp
+            score = np.rint(raw_score * 1000.0) / 1000.0
+            out_scores[i] = score
+            if raw_score > 0.2:
+                out_labels[i] = 0
+            elif raw_score < -0.2:
+                out_labels[i] = 2
+            else:
+                out_labels[i] = 1
+            
+            if status == 2:
+                out_risks[i] = 2  # Already churned
+                continue
+            # Terms are summed in the same order as _calculate_churn_risk
+            risk_score = 0.0
+            if score < -0.5:
+                risk_score = 0.6
+            elif score < 0:
+                risk_score = 0.3
+            elif score > 0.5:
+                risk_score = -0.2
+            risk_score += (0.3 if status == 1 else 0.0) - (0.1 if segment == 2 else 0.0)
+            risk_score += risk_noise[i]
+            if risk_score > 0.6:
+                out_risks[i] = 2
+            elif risk_score > 0.3:
+                out_risks[i] = 1
+            else:
+                out_risks[i] = 0
+else:
+    _score_feedback_kernel = None
+
+def _generate_with_rng(generator, method_name, rng, *args):
+    """Run a generator method on a copy that draws from its own random stream"""
+    generator = copy.copy(generator)
+    generator.rng = rng
+    return getattr(generator, method_name)(*args)
+
 class CRMDataGenerator:
     def __init__(self):
         self.fake = Faker()
         Faker.seed(42)  # For reproducible results
-        np.random.seed(42)
-        random.seed(42)
+        self.rng = np.random.default_rng(42)
         
         # Define realistic company domains and industry keywords
         self.company_domains = [
@@ -41,6 +110,74 @@ class CRMDataGenerator:
             'lack of features', 'integration difficulties', 'training needed',
             'system downtime', 'data migration issues', 'security concerns'
         ]
+        
+        # Feedback text templates and the component pools used to fill them
+        self.feedback_templates = {
+            'positive': [
+                "The {product} has been {positive_word}! Our team is very {positive_word} with the results.",
+                "Excellent {category}. The support team was {positive_word} and {positive_word}.",
+                "We're {positive_word} with the {product}. It has {positive_word} our workflow significantly.",
+                "Outstanding experience! The {category} exceeded our expectations.",
+                "The platform is {positive_word} and our productivity has {positive_word} dramatically."
+            ],
+            'negative': [
+                "Very {negative_word} experience. We're having issues with {pain_point}.",
+                "The {product} is {negative_word} and we're experiencing {pain_point}.",
+                "Frustrated with {pain_point}. The service has been {negative_word}.",
+                "The {category} needs improvement. We're dealing with {pain_point}.",
+                "Disappointed with the {negative_word} {category} and ongoing {pain_point}."
+            ],
+            'neutral': [
+                "The {product} is {neutral_word}. It meets our basic requirements.",
+                "Average experience with {category}. Nothing exceptional but {neutral_word}.",
+                "The service is {neutral_word}. Some areas could be improved.",
+                "Standard {product} with {neutral_word} performance.",
+                "The platform is {neutral_word} for our needs."
+            ]
+        }
+        self.feedback_products = ['platform', 'software', 'solution', 'system']
+        self.feedback_components = {
+            'positive': (self.positive_keywords, ['service', 'support', 'implementation', 'training']),
+            'negative': (self.negative_keywords, ['service', 'support', 'implementation', 'pricing']),
+            'neutral': (self.neutral_keywords, ['service', 'support', 'performance', 'features'])
+        }
+        
+        self.industries = [
+            'Technology', 'Healthcare', 'Finance', 'Manufacturing',
+            'Retail', 'Education', 'Government', 'Non-Profit'
+        ]
+        
+        # Deal and feedback attribute pools
+        self.deal_types = ['License', 'Subscription', 'Implementation', 'Upgrade', 'Renewal']
+        self.products = [
+            'CRM Platform', 'Analytics Suite', 'Integration Package',
+            'Premium Support', 'Custom Development', 'Training Services'
+        ]
+        self.lead_sources = [
+            'Inbound Lead', 'Referral', 'Cold Outreach', 'Marketing Campaign',
+            'Existing Customer', 'Partner'
+        ]
+        self.feedback_channels = ['Email', 'Phone', 'Survey', 'Chat', 'Social Media', 'Support Ticket']
+        self.feedback_categories = [
+            'Product Quality', 'Customer Service', 'Pricing', 'Features',
+            'Performance', 'Support', 'Implementation', 'Training'
+        ]
+        
+        # Deal stage lookup tables, indexed by stage position
+        self.deal_stages = np.array([
+            'Prospecting', 'Qualification', 'Proposal', 'Negotiation', 'Closed Won', 'Closed Lost'
+        ])
+        self.close_prob_low = np.array([0.1, 0.2, 0.4, 0.6, 1.0, 0.0])
+        self.close_prob_high = np.array([0.3, 0.4, 0.6, 0.8, 1.0, 0.0])
+        self.close_days_back = np.array([0, 0, 0, 0, 90, 90])  # Closed deals closed recently
+        self.close_days_ahead = np.array([90, 60, 30, 15, 0, 0])
+        
+        # Stage probabilities by customer status (rows: Active, Inactive, Churned)
+        self.stage_probs_by_status = np.array([
+            [0.2, 0.25, 0.2, 0.15, 0.15, 0.05],  # Normal distribution
+            [0.3, 0.2, 0.2, 0.1, 0.1, 0.1],  # Early stages
+            [0.1, 0.1, 0.1, 0.1, 0.1, 0.5]  # Mostly closed lost
+        ])
 
     def generate_customers(self, num_customers=500, regions=None, segments=None):
         """Generate realistic customer data"""
@@ -49,285 +186,241 @@ class CRMDataGenerator:
         if segments is None:
             segments = ['SMB', 'Mid-Market', 'Enterprise']
         
-        customers = []
+        # Faker is row-wise, so only names, companies and phones go through it
+        first_names = [self.fake.first_name() for _ in range(num_customers)]
+        last_names = [self.fake.last_name() for _ in range(num_customers)]
+        company_names = [self.fake.company() for _ in range(num_customers)]
+        phones = [self.fake.phone_number() for _ in range(num_customers)]
+        managers = [f"{self.fake.first_name()} {self.fake.last_name()}" for _ in range(num_customers)]
+        domains = self.rng.choice(self.company_domains, size=num_customers)
         
-        for i in range(num_customers):
-            customer_id = f"CUST_{i+1:05d}"
-            
-            # Generate realistic customer profile
-            first_name = self.fake.first_name()
-            last_name = self.fake.last_name()
-            company_name = self.fake.company()
-            
-            customer = {
-                'Customer_ID': customer_id,
-                'Customer_Name': f"{first_name} {last_name}",
-                'Company_Name': company_name,
-                'Email': f"{first_name.lower()}.{last_name.lower()}@{random.choice(self.company_domains)}",
-                'Phone': self.fake.phone_number(),
-                'Segment': np.random.choice(segments, p=[0.5, 0.3, 0.2]),  # Weighted towards SMB
-                'Region': np.random.choice(regions, p=[0.4, 0.35, 0.25]),  # Weighted towards North America
-                'Industry': self.fake.random_element([
-                    'Technology', 'Healthcare', 'Finance', 'Manufacturing', 
-                    'Retail', 'Education', 'Government', 'Non-Profit'
-                ]),
-                'Company_Size': self._get_company_size(),
-                'Account_Manager': f"{self.fake.first_name()} {self.fake.last_name()}",
-                'Created_Date': self.fake.date_between(start_date='-2y', end_date='today'),
-                'Last_Activity': self.fake.date_between(start_date='-30d', end_date='today'),
-                'Annual_Revenue': self._get_annual_revenue(),
-                'Status': np.random.choice(['Active', 'Inactive', 'Churned'], p=[0.8, 0.15, 0.05])
-            }
-            customers.append(customer)
-        
-        return pd.DataFrame(customers)
+        customers = pd.DataFrame({
+            'Customer_ID': pd.Series(np.arange(1, num_customers + 1)).astype(str).str.zfill(5).radd('CUST_'),
+            'Customer_Name': [f"{first} {last}" for first, last in zip(first_names, last_names)],
+            'Company_Name': company_names,
+            'Email': [
+                f"{first.lower()}.{last.lower()}@{domain}"
+                for first, last, domain in zip(first_names, last_names, domains)
+            ],
+            'Phone': phones,
+            'Segment': self.rng.choice(segments, size=num_customers, p=[0.5, 0.3, 0.2]),  # Weighted towards SMB
+            'Region': self.rng.choice(regions, size=num_customers, p=[0.4, 0.35, 0.25]),  # Weighted towards North America
+            'Industry': self.rng.choice(self.industries, size=num_customers),
+            'Company_Size': self._get_company_size(num_customers),
+            'Account_Manager': managers,
+            'Created_Date': self._random_dates(num_customers, days_back=730),
+            'Last_Activity': self._random_dates(num_customers, days_back=30),
+            'Annual_Revenue': self._get_annual_revenue(num_customers),
+            'Status': self.rng.choice(['Active', 'Inactive', 'Churned'], size=num_customers, p=[0.8, 0.15, 0.05])
+        })
+        
+        return customers.astype(dict.fromkeys(['Segment', 'Region', 'Industry', 'Company_Size', 'Status'], 'category'))
 
-    def generate_deals(self, customers_df):
+    def generate_deals(self, customers_df, customer_arrays=None):
         """Generate realistic deal data for customers"""
-        deals = []
-        deal_stages = ['Prospecting', 'Qualification', 'Proposal', 'Negotiation', 'Closed Won', 'Closed Lost']
+        if customer_arrays is None:
+            customer_arrays = self._customer_arrays(customers_df)
         
-        # Generate 1-3 deals per customer on average
-        for _, customer in customers_df.iterrows():
-            num_deals = np.random.poisson(1.5) + 1  # At least 1 deal
-            
-            for i in range(min(num_deals, 5)):  # Cap at 5 deals per customer
-                deal_id = f"DEAL_{customer['Customer_ID']}_{i+1}"
-                
-                # Deal size based on segment
-                deal_size = self._get_deal_size(customer['Segment'])
-                
-                # Stage probability based on customer status
-                stage_probs = self._get_stage_probabilities(customer['Status'])
-                stage = np.random.choice(deal_stages, p=stage_probs)
-                
-                deal = {
-                    'Deal_ID': deal_id,
-                    'Customer_ID': customer['Customer_ID'],
-                    'Deal_Name': f"{customer['Company_Name']} - {self.fake.random_element(['License', 'Subscription', 'Implementation', 'Upgrade', 'Renewal'])}",
-                    'Deal_Size': deal_size,
-                    'Stage': stage,
-                    'Close_Probability': self._get_close_probability(stage),
-                    'Expected_Close_Date': self._get_expected_close_date(stage),
-                    'Created_Date': self.fake.date_between(start_date='-1y', end_date='today'),
-                    'Owner': customer['Account_Manager'],
-                    'Product': self.fake.random_element([
-                        'CRM Platform', 'Analytics Suite', 'Integration Package', 
-                        'Premium Support', 'Custom Development', 'Training Services'
-                    ]),
-                    'Source': self.fake.random_element([
-                        'Inbound Lead', 'Referral', 'Cold Outreach', 'Marketing Campaign', 
-                        'Existing Customer', 'Partner'
-                    ])
-                }
-                deals.append(deal)
-        
-        return pd.DataFrame(deals)
+        # Generate 1-3 deals per customer on average, at least 1 and capped at 5
+        num_deals = np.minimum(self.rng.poisson(1.5, size=len(customers_df)) + 1, 5)
+        
+        rows = self._expand(customer_arrays, num_deals,
+                            ['Customer_ID', 'Company_Name', 'Segment', 'Status', 'Account_Manager'])
+        customer_ids = rows['Customer_ID']
+        segments = rows['Segment']
+        statuses = rows['Status']
+        deal_numbers = self._row_numbers(num_deals)
+        num_rows = len(customer_ids)
+        
+        # Deal size based on segment, stage probability based on customer status
+        stage_idx = self._get_deal_stages(statuses)
+        
+        deals = pd.DataFrame({
+            'Deal_ID': [f"DEAL_{customer_id}_{i}" for customer_id, i in zip(customer_ids, deal_numbers)],
+            'Customer_ID': customer_ids,
+            'Deal_Name': pd.Series(rows['Company_Name']) + ' - ' + self.rng.choice(self.deal_types, size=num_rows),
+            'Deal_Size': self._get_deal_size(segments),
+            'Stage': self.deal_stages[stage_idx],
+            'Close_Probability': self._get_close_probability(stage_idx),
+            'Expected_Close_Date': self._get_expected_close_date(stage_idx),
+            'Created_Date': self._random_dates(num_rows, days_back=365),
+            'Owner': rows['Account_Manager'],
+            'Product': self.rng.choice(self.products, size=num_rows),
+            'Source': self.rng.choice(self.lead_sources, size=num_rows)
+        })
+        
+        return deals.astype(dict.fromkeys(['Stage', 'Product', 'Source'], 'category'))
 
-    def generate_feedback(self, customers_df):
+    def generate_feedback(self, customers_df, customer_arrays=None):
         """Generate realistic customer feedback and sentiment data"""
-        feedback = []
+        if customer_arrays is None:
+            customer_arrays = self._customer_arrays(customers_df)
         
-        # Generate 1-5 feedback entries per customer
-        for _, customer in customers_df.iterrows():
-            num_feedback = np.random.poisson(2) + 1  # At least 1 feedback
-            
-            for i in range(min(num_feedback, 8)):  # Cap at 8 feedback per customer
-                feedback_id = f"FB_{customer['Customer_ID']}_{i+1}"
-                
-                # Generate sentiment based on customer status and segment
-                sentiment_score, sentiment_label = self._generate_sentiment(customer)
-                churn_risk = self._calculate_churn_risk(sentiment_score, customer)
-                
-                feedback_text = self._generate_feedback_text(sentiment_score, customer)
-                
-                feedback_entry = {
-                    'Feedback_ID': feedback_id,
-                    'Customer_ID': customer['Customer_ID'],
-                    'Feedback_Text': feedback_text,
-                    'Sentiment_Score': sentiment_score,
-                    'Sentiment_Label': sentiment_label,
-                    'Churn_Risk': churn_risk,
-                    'Feedback_Date': self.fake.date_between(start_date='-6m', end_date='today'),
-                    'Feedback_Channel': self.fake.random_element([
-                        'Email', 'Phone', 'Survey', 'Chat', 'Social Media', 'Support Ticket'
-                    ]),
-                    'Category': self.fake.random_element([
-                        'Product Quality', 'Customer Service', 'Pricing', 'Features', 
-                        'Performance', 'Support', 'Implementation', 'Training'
-                    ]),
-                    'Region': customer['Region'],
-                    'Segment': customer['Segment'],
-                    'Resolved': np.random.choice([True, False], p=[0.8, 0.2]),
-                    'Response_Time_Hours': np.random.exponential(24) if sentiment_score < 0 else np.random.exponential(12)
-                }
-                feedback.append(feedback_entry)
-        
-        return pd.DataFrame(feedback)
+        # Generate 1-5 feedback entries per customer, at least 1 and capped at 8
+        num_feedback = np.minimum(self.rng.poisson(2, size=len(customers_df)) + 1, 8)
+        
+        rows = self._expand(customer_arrays, num_feedback, ['Customer_ID', 'Segment', 'Status', 'Region'])
+        customer_ids = rows['Customer_ID']
+        segments = rows['Segment']
+        statuses = rows['Status']
+        feedback_numbers = self._row_numbers(num_feedback)
+        num_rows = len(customer_ids)
+        
+        # Generate sentiment based on customer status and segment
+        sentiment_scores, sentiment_labels, churn_risks = self._score_feedback(statuses, segments)
+        
+        feedback = pd.DataFrame({
+            'Feedback_ID': [f"FB_{customer_id}_{i}" for customer_id, i in zip(customer_ids, feedback_numbers)],
+            'Customer_ID': customer_ids,
+            'Feedback_Text': self._generate_feedback_text(sentiment_scores),
+            'Sentiment_Score': sentiment_scores,
+            'Sentiment_Label': sentiment_labels,
+            'Churn_Risk': churn_risks,
+            'Feedback_Date': self._random_dates(num_rows, days_back=182),
+            'Feedback_Channel': self.rng.choice(self.feedback_channels, size=num_rows),
+            'Category': self.rng.choice(self.feedback_categories, size=num_rows),
+            'Region': rows['Region'],
+            'Segment': segments,
+            'Resolved': self.rng.choice([True, False], size=num_rows, p=[0.8, 0.2]),
+            'Response_Time_Hours': self.rng.exponential(np.where(sentiment_scores < 0, 24, 12))
+        })
+        
+        return feedback.astype(dict.fromkeys([
+            'Sentiment_Label', 'Churn_Risk', 'Feedback_Channel', 'Category', 'Region', 'Segment'
+        ], 'category'))
+
+    def _customer_arrays(self, customers_df):
+        """Materialize the customer columns that deals and feedback inherit as NumPy arrays"""
+        return {
+            column: customers_df[column].to_numpy()
+            for column in ('Customer_ID', 'Company_Name', 'Segment', 'Status', 'Region', 'Account_Manager')
+        }
 
-    def _get_company_size(self):
+    def _expand(self, customer_arrays, counts, columns):
+        """Repeat each customer's values once per generated child row"""
+        return {column: np.repeat(customer_arrays[column], counts) for column in columns}
+
+    def _row_numbers(self, counts):
+        """Number rows 1..k within each block of an np.repeat expansion"""
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        return np.arange(counts.sum()) - starts + 1
+
+    def _get_company_size(self, size=None):
         """Generate realistic company size based on segment distribution"""
         size_options = ['1-10', '11-50', '51-200', '201-1000', '1000+']
-        return np.random.choice(size_options, p=[0.3, 0.25, 0.2, 0.15, 0.1])
+        return self.rng.choice(size_options, size=size, p=[0.3, 0.25, 0.2, 0.15, 0.1])
 
-    def _get_annual_revenue(self):
+    def _get_annual_revenue(self, size=None):
         """Generate realistic annual revenue"""
-        return np.random.lognormal(mean=12, sigma=1.5) * 1000  # Log-normal distribution
+        return self.rng.lognormal(mean=12, sigma=1.5, size=size) * 1000  # Log-normal distribution
 
-    def _get_deal_size(self, segment):
-        """Generate deal size based on customer segment"""
-        if segment == 'Enterprise':
-            return np.random.normal(150000, 50000)
-        elif segment == 'Mid-Market':
-            return np.random.normal(50000, 15000)
-        else:  # SMB
-            return np.random.normal(15000, 5000)
+    def _random_dates(self, size, days_back, days_ahead=0):
+        """Generate dates uniformly between days_back ago and days_ahead from today"""
+        offsets = self.rng.integers(-days_back, days_ahead + 1, size=size)
+        return pd.Timestamp.today().normalize() + pd.to_timedelta(offsets, unit='D')
 
-    def _get_stage_probabilities(self, status):
-        """Get stage probabilities based on customer status"""
-        if status == 'Churned':
-            return [0.1, 0.1, 0.1, 0.1, 0.1, 0.5]  # Mostly closed lost
-        elif status == 'Inactive':
-            return [0.3, 0.2, 0.2, 0.1, 0.1, 0.1]  # Early stages
-        else:  # Active
-            return [0.2, 0.25, 0.2, 0.15, 0.15, 0.05]  # Normal distribution
+    def _get_deal_size(self, segments):
+        """Generate deal sizes based on customer segment"""
+        is_enterprise = segments == 'Enterprise'
+        is_mid_market = segments == 'Mid-Market'
+        # SMB otherwise
+        mean = np.where(is_enterprise, 150000, np.where(is_mid_market, 50000, 15000))
+        std = np.where(is_enterprise, 50000, np.where(is_mid_market, 15000, 5000))
+        return self.rng.normal(mean, std)
 
-    def _get_close_probability(self, stage):
-        """Get close probability based on deal stage"""
-        probabilities = {
-            'Prospecting': np.random.uniform(0.1, 0.3),
-            'Qualification': np.random.uniform(0.2, 0.4),
-            'Proposal': np.random.uniform(0.4, 0.6),
-            'Negotiation': np.random.uniform(0.6, 0.8),
-            'Closed Won': 1.0,
-            'Closed Lost': 0.0
-        }
-        return probabilities.get(stage, 0.5)
+    def _get_deal_stages(self, statuses):
+        """Sample a deal stage index per row from its customer status' stage distribution"""
+        status_idx = np.select([statuses == 'Inactive', statuses == 'Churned'], [1, 2], 0)
+        
+        # Inverse-CDF sampling: count how many cumulative bins each uniform draw passes
+        cdf = self.stage_probs_by_status.cumsum(axis=1)[status_idx]
+        stage_idx = (self.rng.random(len(statuses))[:, None] > cdf).sum(axis=1)
+        return np.minimum(stage_idx, len(self.deal_stages) - 1)
+
+    def _get_close_probability(self, stage_idx):
+        """Get close probability based on deal stage index"""
+        return self.rng.uniform(self.close_prob_low[stage_idx], self.close_prob_high[stage_idx])
+
+    def _get_expected_close_date(self, stage_idx):
+        """Get expected close date based on stage: recent for closed deals, upcoming otherwise"""
+        return self._random_dates(len(stage_idx),
+                                  days_back=self.close_days_back[stage_idx],
+                                  days_ahead=self.close_days_ahead[stage_idx])
 
-    def _get_expected_close_date(self, stage):
-        """Get expected close date based on stage"""
-        if stage in ['Closed Won', 'Closed Lost']:
-            return self.fake.date_between(start_date='-90d', end_date='today')
-        else:
-            days_ahead = {
-                'Prospecting': 90,
-                'Qualification': 60,
-                'Proposal': 30,
-                'Negotiation': 15
-            }
-            return self.fake.date_between(start_date='today', 
-                                        end_date=f'+{days_ahead.get(stage, 45)}d')
+    def _score_feedback(self, statuses, segments):
+        """Generate sentiment scores, labels and churn risks for feedback rows"""
+        if _score_feedback_kernel is None or len(statuses) < NUMBA_MIN_ROWS:
+            sentiment_scores, sentiment_labels = self._generate_sentiment(statuses, segments)
+            return sentiment_scores, sentiment_labels, self._calculate_churn_risk(sentiment_scores, statuses, segments)
+        
+        # Integer codes for the kernel: status Active/Inactive/Churned -> 0/1/2, segment other/SMB/Enterprise -> 0/1/2
+        num_rows = len(statuses)
+        status_codes = np.select([statuses == 'Inactive', statuses == 'Churned'], [1, 2], 0).astype(np.int8)
+        segment_codes = np.select([segments == 'SMB', segments == 'Enterprise'], [1, 2], 0).astype(np.int8)
+        sentiment_scores = np.empty(num_rows)
+        label_codes = np.empty(num_rows, dtype=np.int8)
+        risk_codes = np.empty(num_rows, dtype=np.int8)
+        _score_feedback_kernel(status_codes, segment_codes,
+                               self.rng.normal(0, 0.3, size=num_rows),
+                               self.rng.uniform(-0.1, 0.1, size=num_rows),
+                               sentiment_scores, label_codes, risk_codes)
+        return sentiment_scores, SENTIMENT_LABELS[label_codes], CHURN_RISKS[risk_codes]
 
-    def _generate_sentiment(self, customer):
-        """Generate sentiment score and label based on customer characteristics"""
-        base_sentiment = 0
-        
-        # Adjust based on customer status
-        if customer['Status'] == 'Churned':
-            base_sentiment -= 0.5
-        elif customer['Status'] == 'Inactive':
-            base_sentiment -= 0.2
-        
-        # Adjust based on segment (Enterprise customers might be more demanding)
-        if customer['Segment'] == 'Enterprise':
-            base_sentiment -= 0.1
-        elif customer['Segment'] == 'SMB':
-            base_sentiment += 0.1
+    def _generate_sentiment(self, statuses, segments):
+        """Generate sentiment scores and labels based on customer characteristics"""
+        # Adjust based on customer status, then segment (Enterprise customers might be more demanding)
+        base_sentiment = (
+            -0.5 * (statuses == 'Churned') - 0.2 * (statuses == 'Inactive')
+            - 0.1 * (segments == 'Enterprise') + 0.1 * (segments == 'SMB')
+        )
         
         # Add random variation
-        sentiment_score = np.clip(base_sentiment + np.random.normal(0, 0.3), -1, 1)
+        sentiment_scores = np.clip(base_sentiment + self.rng.normal(0, 0.3, size=len(statuses)), -1, 1)
         
         # Convert to label
-        if sentiment_score > 0.2:
-            sentiment_label = 'Positive'
-        elif sentiment_score < -0.2:
-            sentiment_label = 'Negative'
-        else:
-            sentiment_label = 'Neutral'
-        
-        return round(sentiment_score, 3), sentiment_label
+        sentiment_labels = np.where(sentiment_scores > 0.2, 'Positive',
+                                    np.where(sentiment_scores < -0.2, 'Negative', 'Neutral'))
+        
+        return sentiment_scores.round(3), sentiment_labels
 
-    def _calculate_churn_risk(self, sentiment_score, customer):
+    def _calculate_churn_risk(self, sentiment_scores, statuses, segments):
         """Calculate churn risk based on sentiment and customer factors"""
-        risk_score = 0
-        
         # Sentiment impact (most important factor)
-        if sentiment_score < -0.5:
-            risk_score += 0.6
-        elif sentiment_score < 0:
-            risk_score += 0.3
-        elif sentiment_score > 0.5:
-            risk_score -= 0.2
-        
-        # Customer status impact
-        if customer['Status'] == 'Churned':
-            return 'High'  # Already churned
-        elif customer['Status'] == 'Inactive':
-            risk_score += 0.3
-        
-        # Segment impact
-        if customer['Segment'] == 'Enterprise':
-            risk_score -= 0.1  # Less likely to churn due to switching costs
+        risk_scores = np.select(
+            [sentiment_scores < -0.5, sentiment_scores < 0, sentiment_scores > 0.5], [0.6, 0.3, -0.2], 0.0
+        )
+        
+        # Customer status and segment impact (Enterprise less likely to churn due to switching costs)
+        risk_scores += 0.3 * (statuses == 'Inactive') - 0.1 * (segments == 'Enterprise')
         
         # Random factor
-        risk_score += np.random.uniform(-0.1, 0.1)
-        
-        # Convert to category
-        if risk_score > 0.6:
-            return 'High'
-        elif risk_score > 0.3:
-            return 'Medium'
-        else:
-            return 'Low'
+        risk_scores += self.rng.uniform(-0.1, 0.1, size=len(statuses))
+        
+        # Convert to category; churned customers are already high risk
+        churn_risks = np.where(risk_scores > 0.6, 'High', np.where(risk_scores > 0.3, 'Medium', 'Low'))
+        return np.where(statuses == 'Churned', 'High', churn_risks)
 
-    def _generate_feedback_text(self, sentiment_score, customer):
+    def _generate_feedback_text(self, sentiment_scores):
         """Generate realistic feedback text based on sentiment"""
-        templates = {
-            'positive': [
-                "The {product} has been {positive_word}! Our team is very {positive_word} with the results.",
-                "Excellent {category}. The support team was {positive_word} and {positive_word}.",
-                "We're {positive_word} with the {product}. It has {positive_word} our workflow significantly.",
-                "Outstanding experience! The {category} exceeded our expectations.",
-                "The platform is {positive_word} and our productivity has {positive_word} dramatically."
-            ],
-            'negative': [
-                "Very {negative_word} experience. We're having issues with {pain_point}.",
-                "The {product} is {negative_word} and we're experiencing {pain_point}.",
-                "Frustrated with {pain_point}. The service has been {negative_word}.",
-                "The {category} needs improvement. We're dealing with {pain_point}.",
-                "Disappointed with the {negative_word} {category} and ongoing {pain_point}."
-            ],
-            'neutral': [
-                "The {product} is {neutral_word}. It meets our basic requirements.",
-                "Average experience with {category}. Nothing exceptional but {neutral_word}.",
-                "The service is {neutral_word}. Some areas could be improved.",
-                "Standard {product} with {neutral_word} performance.",
-                "The platform is {neutral_word} for our needs."
-            ]
-        }
+        feedback = np.empty(len(sentiment_scores), dtype=object)
+        buckets = np.where(sentiment_scores > 0.2, 'positive',
+                           np.where(sentiment_scores < -0.2, 'negative', 'neutral'))
         
-        if sentiment_score > 0.2:
-            template = random.choice(templates['positive'])
-            feedback = template.format(
-                product=random.choice(['platform', 'software', 'solution', 'system']),
-                positive_word=random.choice(self.positive_keywords),
-                category=random.choice(['service', 'support', 'implementation', 'training'])
-            )
-        elif sentiment_score < -0.2:
-            template = random.choice(templates['negative'])
-            feedback = template.format(
-                product=random.choice(['platform', 'software', 'solution', 'system']),
-                negative_word=random.choice(self.negative_keywords),
-                pain_point=random.choice(self.pain_points),
-                category=random.choice(['service', 'support', 'implementation', 'pricing'])
-            )
-        else:
-            template = random.choice(templates['neutral'])
-            feedback = template.format(
-                product=random.choice(['platform', 'software', 'solution', 'system']),
-                neutral_word=random.choice(self.neutral_keywords),
-                category=random.choice(['service', 'support', 'performance', 'features'])
-            )
+        # Sample every template component for a sentiment bucket in bulk, then fill the templates
+        for sentiment, (keywords, categories) in self.feedback_components.items():
+            rows = np.flatnonzero(buckets == sentiment)
+            templates = self.feedback_templates[sentiment]
+            feedback[rows] = [
+                template.format(product=product, category=category, pain_point=pain_point,
+                                **{f'{sentiment}_word': word})
+                for template, product, word, category, pain_point in zip(
+                    self.rng.choice(templates, size=len(rows)),
+                    self.rng.choice(self.feedback_products, size=len(rows)),
+                    self.rng.choice(keywords, size=len(rows)),
+                    self.rng.choice(categories, size=len(rows)),
+                    self.rng.choice(self.pain_points, size=len(rows))
+                )
+            ]
         
         return feedback
 
@@ -339,12 +432,15 @@ class CRMDataGenerator:
         customers_df = self.generate_customers(num_customers, regions, segments)
         logging.info(f"Generated {len(customers_df)} customers")
         
-        # Generate deals
-        deals_df = self.generate_deals(customers_df)
-        logging.info(f"Generated {len(deals_df)} deals")
+        # Deals and feedback share the same customer column arrays but draw from
+        # independent random streams, so neither table depends on the other's draws
+        customer_arrays = self._customer_arrays(customers_df)
+        deals_rng, feedback_rng = self.rng.spawn(2)
         
-        # Generate feedback
-        feedback_df = self.generate_feedback(customers_df)
+        # Generate deals and feedback
+        deals_df = _generate_with_rng(self, 'generate_deals', deals_rng, customers_df, customer_arrays)
+        feedback_df = _generate_with_rng(self, 'generate_feedback', feedback_rng, customers_df, customer_arrays)
+        logging.info(f"Generated {len(deals_df)} deals")
         logging.info(f"Generated {len(feedback_df)} feedback entries")
         
         # Calculate summary statistics
@@ -354,20 +450,28 @@ class CRMDataGenerator:
 
     def _calculate_summary_stats(self, customers_df, deals_df, feedback_df):
         """Calculate summary statistics for the generated data"""
+        # One aggregation pass per table; the marginals are derived from the grouped sums and counts
+        churn_counts = feedback_df['Churn_Risk'].value_counts()
+        stage_totals = deals_df.groupby('Stage', observed=True)['Deal_Size'].agg(['sum', 'count'])
+        sentiment_cells = feedback_df.groupby(['Region', 'Segment'], observed=True)['Sentiment_Score'].agg(['sum', 'count'])
+        sentiment_by_region = sentiment_cells.groupby(level='Region', observed=True).sum()
+        sentiment_by_segment = sentiment_cells.groupby(level='Segment', observed=True).sum()
+        open_stages = self.deal_stages[:4]
+        
         stats = {
             'total_customers': len(customers_df),
             'total_deals': len(deals_df),
             'total_feedback': len(feedback_df),
-            'avg_sentiment': round(feedback_df['Sentiment_Score'].mean(), 3),
-            'churn_risk_high': len(feedback_df[feedback_df['Churn_Risk'] == 'High']),
-            'churn_risk_percent': round((len(feedback_df[feedback_df['Churn_Risk'] == 'High']) / len(feedback_df)) * 100, 1),
-            'total_pipeline': round(deals_df[deals_df['Stage'].isin(['Prospecting', 'Qualification', 'Proposal', 'Negotiation'])]['Deal_Size'].sum(), 0),
-            'won_deals': len(deals_df[deals_df['Stage'] == 'Closed Won']),
-            'lost_deals': len(deals_df[deals_df['Stage'] == 'Closed Lost']),
+            'avg_sentiment': round(sentiment_cells['sum'].sum() / sentiment_cells['count'].sum(), 3),
+            'churn_risk_high': int(churn_counts.get('High', 0)),
+            'churn_risk_percent': round((churn_counts.get('High', 0) / len(feedback_df)) * 100, 1),
+            'total_pipeline': round(stage_totals['sum'].reindex(open_stages).sum(), 0),
+            'won_deals': int(stage_totals['count'].get('Closed Won', 0)),
+            'lost_deals': int(stage_totals['count'].get('Closed Lost', 0)),
             'regions': customers_df['Region'].value_counts().to_dict(),
             'segments': customers_df['Segment'].value_counts().to_dict(),
-            'sentiment_by_region': feedback_df.groupby('Region')['Sentiment_Score'].mean().round(3).to_dict(),
-            'sentiment_by_segment': feedback_df.groupby('Segment')['Sentiment_Score'].mean().round(3).to_dict()
+            'sentiment_by_region': (sentiment_by_region['sum'] / sentiment_by_region['count']).round(3).to_dict(),
+            'sentiment_by_segment': (sentiment_by_segment['sum'] / sentiment_by_segment['count']).round(3).to_dict()
         }
         
         return stats
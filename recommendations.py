@@ -1,324 +1,535 @@
 import pandas as pd
 import numpy as np
-from collections import Counter
+from collections import namedtuple
+from dataclasses import dataclass
 import re
+import copy
+
+# Feedback columns shared by the analyses, extracted once as NumPy arrays
+FeedbackArrays = namedtuple('FeedbackArrays', [
+    'sentiment', 'negative', 'high_risk', 'resolved', 'response_time', 'customer_codes'
+])
+# Deal sizes and integer stage codes, extracted once per run
+DealArrays = namedtuple('DealArrays', ['deal_size', 'stage_codes', 'stage_categories', 'customer_codes'])
+# Customer_IDs of both tables factorized onto one shared code range
+CustomerCodes = namedtuple('CustomerCodes', ['feedback', 'deals', 'count'])
+
+
+# Slotted records for the emitted recommendations; Flask's jsonify serializes dataclasses as dicts
+@dataclass(slots=True)
+class Action:
+    action: str
+    priority: str
+    impact: str
+    metric: str
+
+@dataclass(slots=True)
+class ChurnRecommendation:
+    recommendation: str
+    reason: str
+    action: str
+
+@dataclass(slots=True)
+class Opportunity:
+    opportunity: str
+    potential: str
+    action: str
+
+@dataclass(slots=True)
+class Insight:
+    insight: str
+    detail: str
+    recommendation: str
+
+@dataclass(slots=True)
+class SegmentInsight:
+    segment: str
+    avg_sentiment: float
+    high_risk_count: int
+    avg_response_time: float
+    recommendation: str
+
+@dataclass(slots=True)
+class RegionalInsight:
+    region: str
+    avg_sentiment: float
+    high_risk_count: int
+    avg_response_time: float
+    recommendation: str
+
+@dataclass(slots=True)
+class PainPoint:
+    pain_point: str
+    frequency: int
+
+# Low-cardinality string columns compared and grouped on as categorical codes
+FEEDBACK_CATEGORICAL_COLUMNS = ['Churn_Risk', 'Segment', 'Region', 'Feedback_Channel', 'Category']
+DEAL_CATEGORICAL_COLUMNS = ['Stage']
+
+def _match_pain_points(texts, pattern, keyword_ids):
+    """Scan texts for pain-point keywords; returns matched keyword ids and the match count per text"""
+    # Each keyword counts once per text
+    matched = [set(matches) for matches in texts.str.lower().str.findall(pattern)]
+    pain_point_ids = np.fromiter((keyword_ids[keyword] for keywords in matched for keyword in keywords), dtype=np.intp)
+    return pain_point_ids, np.fromiter(map(len, matched), dtype=np.intp, count=len(matched))
 
 class AIRecommendations:
+    # Recommendation text per metric condition, filled with the segment or region name
+    _SEGMENT_TEMPLATES = {
+        'satisfaction': "High priority: Address satisfaction issues in {} segment",
+        'churn': "Focus on churn prevention for {} customers",
+        'response_time': "Improve response times for {} segment",
+        'maintain': "Maintain current service levels for {} segment"
+    }
+    _REGIONAL_TEMPLATES = {
+        'satisfaction': "Deploy additional resources to improve {} satisfaction",
+        'churn': "Implement retention program in {}",
+        'response_time': "Strengthen support coverage in {}",
+        'maintain': "Leverage {} best practices for other regions"
+    }
+
+    # What the full pipeline produces when there are no deals and no feedback
+    _EMPTY_RESULT = {
+        'priority_actions': [],
+        'churn_prevention': [],
+        'revenue_opportunities': [],
+        'operational_insights': [Insight(
+            insight='Resolution impact on sentiment',
+            detail='Resolved issues: nan avg sentiment, Unresolved: nan',
+            recommendation='Focus on improving resolution rates and quality'
+        )],
+        'segment_insights': [],
+        'regional_insights': [],
+        'pain_point_analysis': {
+            'top_pain_points': [], 'total_pain_points': 0, 'unique_pain_points': 0, 'recommendations': []
+        },
+        'success_metrics': {
+            'customer_satisfaction': {'avg_sentiment': np.nan, 'positive_sentiment_rate': np.nan, 'negative_sentiment_rate': np.nan},
+            'churn_metrics': {'high_risk_rate': np.nan, 'low_risk_rate': np.nan},
+            'operational_metrics': {'avg_response_time': np.nan, 'resolution_rate': np.nan, 'feedback_volume': 0},
+            'sales_metrics': {'total_pipeline': 0.0, 'avg_deal_size': np.nan, 'win_rate': 0}
+        }
+    }
+
     def __init__(self):
         self.pain_point_keywords = [
             'slow', 'expensive', 'difficult', 'complicated', 'poor', 'terrible',
             'frustrated', 'disappointed', 'issues', 'problems', 'downtime',
             'billing', 'support', 'training', 'integration', 'security'
         ]
+        # One compiled alternation scans each text once instead of once per keyword
+        self._pain_regex = re.compile('|'.join(map(re.escape, self.pain_point_keywords)))
+        self._pain_keyword_ids = {keyword: i for i, keyword in enumerate(self.pain_point_keywords)}
 
     def generate_recommendations(self, customers_df, deals_df, feedback_df):
         """Generate AI-powered recommendations based on CRM and sentiment data"""
+        if feedback_df.empty and deals_df.empty:
+            return copy.deepcopy(self._EMPTY_RESULT)
+        
+        feedback_df = self._as_categorical(feedback_df, FEEDBACK_CATEGORICAL_COLUMNS)
+        deals_df = self._as_categorical(deals_df, DEAL_CATEGORICAL_COLUMNS)
+        
+        # Masks and per-group aggregates are computed once and shared by the analyses
+        customer_codes = self._factorize_customers(feedback_df, deals_df)
+        feedback_arrays = self._get_feedback_arrays(feedback_df, customer_codes)
+        deal_arrays = self._get_deal_arrays(deals_df, customer_codes)
+        segment_metrics = self._group_feedback_metrics(feedback_df, feedback_arrays, 'Segment')
+        regional_metrics = self._group_feedback_metrics(feedback_df, feedback_arrays, 'Region')
+        channel_sentiment = feedback_df.groupby('Feedback_Channel', observed=True)['Sentiment_Score'].mean()
+        category_sentiment = feedback_df.groupby('Category', observed=True)['Sentiment_Score'].mean()
         
         recommendations = {
-            'priority_actions': self._get_priority_actions(customers_df, deals_df, feedback_df),
-            'churn_prevention': self._get_churn_prevention_recommendations(customers_df, feedback_df),
-            'revenue_opportunities': self._get_revenue_opportunities(customers_df, deals_df, feedback_df),
-            'operational_insights': self._get_operational_insights(feedback_df),
-            'segment_insights': self._get_segment_insights(customers_df, feedback_df),
-            'regional_insights': self._get_regional_insights(customers_df, feedback_df),
-            'pain_point_analysis': self._analyze_pain_points(feedback_df),
-            'success_metrics': self._calculate_success_metrics(customers_df, deals_df, feedback_df)
+            'priority_actions': self._get_priority_actions(deal_arrays, feedback_arrays),
+            'churn_prevention': self._get_churn_prevention_recommendations(feedback_arrays, segment_metrics, regional_metrics),
+            'revenue_opportunities': self._get_revenue_opportunities(deal_arrays, feedback_df, feedback_arrays, customer_codes.count),
+            'operational_insights': self._get_operational_insights(feedback_arrays, channel_sentiment, category_sentiment),
+            'segment_insights': self._get_segment_insights(segment_metrics),
+            'regional_insights': self._get_regional_insights(regional_metrics),
+            'pain_point_analysis': self._analyze_pain_points(feedback_df, feedback_arrays),
+            'success_metrics': self._calculate_success_metrics(feedback_df, feedback_arrays, deal_arrays)
         }
         
         return recommendations
 
-    def _get_priority_actions(self, customers_df, deals_df, feedback_df):
+    def _as_categorical(self, df, columns):
+        """Return df with the given columns as categoricals, copying only if a cast is needed"""
+        to_cast = {column: 'category' for column in columns
+                   if not isinstance(df[column].dtype, pd.CategoricalDtype)}
+        return df.astype(to_cast) if to_cast else df
+
+    def _codes_mask(self, codes, categories, values):
+        """Boolean mask of categorical codes matching any of the given values"""
+        value_codes = categories.get_indexer(values)
+        value_codes = value_codes[value_codes >= 0]
+        if len(value_codes) == 1:
+            return codes == value_codes[0]
+        return np.isin(codes, value_codes)
+
+    def _category_mask(self, series, values):
+        """Boolean mask of a categorical Series matching any of the given values"""
+        return self._codes_mask(series.cat.codes.to_numpy(), series.cat.categories, values)
+
+    def _factorize_customers(self, feedback_df, deals_df):
+        """Map feedback and deal Customer_IDs onto shared integer codes"""
+        codes, uniques = pd.factorize(pd.concat([feedback_df['Customer_ID'], deals_df['Customer_ID']], ignore_index=True))
+        return CustomerCodes(feedback=codes[:len(feedback_df)], deals=codes[len(feedback_df):], count=len(uniques))
+
+    def _get_feedback_arrays(self, feedback_df, customer_codes):
+        """Extract the feedback columns the analyses filter on"""
+        sentiment = feedback_df['Sentiment_Score'].to_numpy()
+        return FeedbackArrays(
+            sentiment=sentiment,
+            negative=sentiment < -0.2,
+            high_risk=self._category_mask(feedback_df['Churn_Risk'], ['High']),
+            resolved=feedback_df['Resolved'].to_numpy(bool),
+            response_time=feedback_df['Response_Time_Hours'].to_numpy(),
+            customer_codes=customer_codes.feedback
+        )
+
+    def _get_deal_arrays(self, deals_df, customer_codes):
+        """Extract deal sizes and stage codes"""
+        stages = deals_df['Stage']
+        return DealArrays(
+            deal_size=deals_df['Deal_Size'].to_numpy(),
+            stage_codes=stages.cat.codes.to_numpy(),
+            stage_categories=stages.cat.categories,
+            customer_codes=customer_codes.deals
+        )
+
+    def _stage_mask(self, deal_arrays, stages):
+        """Boolean mask of deals in any of the given stages"""
+        return self._codes_mask(deal_arrays.stage_codes, deal_arrays.stage_categories, stages)
+
+    def _get_priority_actions(self, deal_arrays, feedback_arrays):
         """Generate top priority actions for immediate attention"""
         actions = []
         
         # High churn risk customers
-        high_risk_feedback = feedback_df[feedback_df['Churn_Risk'] == 'High']
-        if len(high_risk_feedback) > 0:
-            high_risk_customers = high_risk_feedback['Customer_ID'].nunique()
-            actions.append({
-                'action': f'Immediate outreach to {high_risk_customers} high-risk customers',
-                'priority': 'High',
-                'impact': 'Prevent customer churn',
-                'metric': f'{high_risk_customers} customers at risk'
-            })
+        if feedback_arrays.high_risk.any():
+            high_risk_customers = np.unique(feedback_arrays.customer_codes[feedback_arrays.high_risk]).size
+            actions.append(Action(
+                action=f'Immediate outreach to {high_risk_customers} high-risk customers',
+                priority='High',
+                impact='Prevent customer churn',
+                metric=f'{high_risk_customers} customers at risk'
+            ))
         
         # Unresolved negative feedback
-        unresolved_negative = feedback_df[
-            (feedback_df['Sentiment_Score'] < -0.3) & 
-            (feedback_df['Resolved'] == False)
-        ]
-        if len(unresolved_negative) > 0:
-            actions.append({
-                'action': f'Resolve {len(unresolved_negative)} outstanding negative feedback cases',
-                'priority': 'High',
-                'impact': 'Improve customer satisfaction',
-                'metric': f'{len(unresolved_negative)} unresolved issues'
-            })
+        unresolved_negative = np.count_nonzero((feedback_arrays.sentiment < -0.3) & ~feedback_arrays.resolved)
+        if unresolved_negative > 0:
+            actions.append(Action(
+                action=f'Resolve {unresolved_negative} outstanding negative feedback cases',
+                priority='High',
+                impact='Improve customer satisfaction',
+                metric=f'{unresolved_negative} unresolved issues'
+            ))
         
         # Stalled high-value deals
-        stalled_deals = deals_df[
-            (deals_df['Deal_Size'] > deals_df['Deal_Size'].quantile(0.8)) &
-            (deals_df['Stage'].isin(['Proposal', 'Negotiation']))
-        ]
+        deal_size = deal_arrays.deal_size
+        if deal_size.size > 0:
+            stalled_deals = deal_size[
+                (deal_size > np.quantile(deal_size, 0.8)) &
+                self._stage_mask(deal_arrays, ['Proposal', 'Negotiation'])
+            ]
+        else:
+            stalled_deals = deal_size
         if len(stalled_deals) > 0:
-            total_value = stalled_deals['Deal_Size'].sum()
-            actions.append({
-                'action': f'Accelerate {len(stalled_deals)} high-value deals in late stages',
-                'priority': 'Medium',
-                'impact': 'Increase revenue closure',
-                'metric': f'${total_value:,.0f} in pipeline'
-            })
+            total_value = stalled_deals.sum()
+            actions.append(Action(
+                action=f'Accelerate {len(stalled_deals)} high-value deals in late stages',
+                priority='Medium',
+                impact='Increase revenue closure',
+                metric=f'${total_value:,.0f} in pipeline'
+            ))
         
         return actions
 
-    def _get_churn_prevention_recommendations(self, customers_df, feedback_df):
+    def _get_churn_prevention_recommendations(self, feedback_arrays, segment_metrics, regional_metrics):
         """Generate churn prevention recommendations"""
         recommendations = []
+        if feedback_arrays.sentiment.size == 0:
+            return recommendations
         
         # Analyze churn risk by segment
-        churn_by_segment = feedback_df[feedback_df['Churn_Risk'] == 'High'].groupby('Segment').size()
-        if len(churn_by_segment) > 0:
-            worst_segment = churn_by_segment.idxmax()
-            worst_count = churn_by_segment.max()
-            recommendations.append({
-                'recommendation': f'Focus churn prevention efforts on {worst_segment} segment',
-                'reason': f'{worst_count} high-risk customers identified',
-                'action': f'Implement targeted retention program for {worst_segment} customers'
-            })
+        churn_by_segment = segment_metrics['high_risk_count'].to_numpy()
+        worst = churn_by_segment.argmax() if churn_by_segment.size > 0 else None
+        if worst is not None and churn_by_segment[worst] > 0:
+            worst_segment = segment_metrics.index[worst]
+            worst_count = churn_by_segment[worst]
+            recommendations.append(ChurnRecommendation(
+                recommendation=f'Focus churn prevention efforts on {worst_segment} segment',
+                reason=f'{worst_count} high-risk customers identified',
+                action=f'Implement targeted retention program for {worst_segment} customers'
+            ))
         
         # Analyze churn risk by region
-        churn_by_region = feedback_df[feedback_df['Churn_Risk'] == 'High'].groupby('Region').size()
-        if len(churn_by_region) > 0:
-            worst_region = churn_by_region.idxmax()
-            worst_count = churn_by_region.max()
-            recommendations.append({
-                'recommendation': f'Strengthen customer success in {worst_region} region',
-                'reason': f'{worst_count} high-risk customers in this region',
-                'action': f'Deploy additional customer success resources to {worst_region}'
-            })
+        churn_by_region = regional_metrics['high_risk_count'].to_numpy()
+        worst = churn_by_region.argmax() if churn_by_region.size > 0 else None
+        if worst is not None and churn_by_region[worst] > 0:
+            worst_region = regional_metrics.index[worst]
+            worst_count = churn_by_region[worst]
+            recommendations.append(ChurnRecommendation(
+                recommendation=f'Strengthen customer success in {worst_region} region',
+                reason=f'{worst_count} high-risk customers in this region',
+                action=f'Deploy additional customer success resources to {worst_region}'
+            ))
         
         # Response time analysis
-        slow_responses = feedback_df[
-            (feedback_df['Sentiment_Score'] < 0) & 
-            (feedback_df['Response_Time_Hours'] > 24)
-        ]
-        if len(slow_responses) > 0:
-            recommendations.append({
-                'recommendation': 'Improve response times for negative feedback',
-                'reason': f'{len(slow_responses)} negative feedback cases with >24h response time',
-                'action': 'Implement automated escalation for negative sentiment feedback'
-            })
+        slow_responses = np.count_nonzero((feedback_arrays.sentiment < 0) & (feedback_arrays.response_time > 24))
+        if slow_responses > 0:
+            recommendations.append(ChurnRecommendation(
+                recommendation='Improve response times for negative feedback',
+                reason=f'{slow_responses} negative feedback cases with >24h response time',
+                action='Implement automated escalation for negative sentiment feedback'
+            ))
         
         return recommendations
 
-    def _get_revenue_opportunities(self, customers_df, deals_df, feedback_df):
+    def _get_revenue_opportunities(self, deal_arrays, feedback_df, feedback_arrays, customer_count):
         """Identify revenue growth opportunities"""
         opportunities = []
+        if feedback_df.empty:
+            return opportunities
         
         # Happy customers with small deal sizes (upsell opportunity)
-        happy_customers = feedback_df[feedback_df['Sentiment_Score'] > 0.5]['Customer_ID'].unique()
-        customer_deal_sizes = deals_df.groupby('Customer_ID')['Deal_Size'].mean()
-        small_deal_happy = customer_deal_sizes[customer_deal_sizes.index.isin(happy_customers)]
+        is_happy = np.zeros(customer_count, dtype=bool)
+        is_happy[feedback_arrays.customer_codes[feedback_arrays.sentiment > 0.5]] = True
+        customer_deal_sizes = pd.Series(deal_arrays.deal_size).groupby(deal_arrays.customer_codes).mean()
+        small_deal_happy = customer_deal_sizes[is_happy[customer_deal_sizes.index.to_numpy()]]
         
         if len(small_deal_happy) > 0:
-            avg_deal_size = deals_df['Deal_Size'].mean()
+            avg_deal_size = deal_arrays.deal_size.mean()
             upsell_candidates = small_deal_happy[small_deal_happy < avg_deal_size * 0.7]
             if len(upsell_candidates) > 0:
-                opportunities.append({
-                    'opportunity': f'Upsell {len(upsell_candidates)} satisfied customers with small deal sizes',
-                    'potential': f'${(avg_deal_size - upsell_candidates.mean()) * len(upsell_candidates):,.0f}',
-                    'action': 'Launch targeted upsell campaign to happy customers'
-                })
+                opportunities.append(Opportunity(
+                    opportunity=f'Upsell {len(upsell_candidates)} satisfied customers with small deal sizes',
+                    potential=f'${(avg_deal_size - upsell_candidates.mean()) * len(upsell_candidates):,.0f}',
+                    action='Launch targeted upsell campaign to happy customers'
+                ))
         
         # Enterprise customers with positive sentiment (expansion opportunity)
-        enterprise_happy = feedback_df[
-            (feedback_df['Segment'] == 'Enterprise') & 
-            (feedback_df['Sentiment_Score'] > 0.3)
-        ]['Customer_ID'].nunique()
+        enterprise_happy = self._count_customers(feedback_arrays.customer_codes[
+            self._category_mask(feedback_df['Segment'], ['Enterprise']) & 
+            (feedback_arrays.sentiment > 0.3)
+        ], customer_count)
         
         if enterprise_happy > 0:
-            opportunities.append({
-                'opportunity': f'Expand within {enterprise_happy} satisfied Enterprise accounts',
-                'potential': 'High - Enterprise expansion deals typically 2-3x larger',
-                'action': 'Engage account teams for expansion discussions'
-            })
+            opportunities.append(Opportunity(
+                opportunity=f'Expand within {enterprise_happy} satisfied Enterprise accounts',
+                potential='High - Enterprise expansion deals typically 2-3x larger',
+                action='Engage account teams for expansion discussions'
+            ))
         
         # Positive SMB customers (referral opportunity)
-        smb_happy = feedback_df[
-            (feedback_df['Segment'] == 'SMB') & 
-            (feedback_df['Sentiment_Score'] > 0.6)
-        ]['Customer_ID'].nunique()
+        smb_happy = self._count_customers(feedback_arrays.customer_codes[
+            self._category_mask(feedback_df['Segment'], ['SMB']) & 
+            (feedback_arrays.sentiment > 0.6)
+        ], customer_count)
         
         if smb_happy > 0:
-            opportunities.append({
-                'opportunity': f'Leverage {smb_happy} highly satisfied SMB customers for referrals',
-                'potential': f'Estimated {smb_happy * 0.3:.0f} potential referrals',
-                'action': 'Launch customer referral program'
-            })
+            opportunities.append(Opportunity(
+                opportunity=f'Leverage {smb_happy} highly satisfied SMB customers for referrals',
+                potential=f'Estimated {smb_happy * 0.3:.0f} potential referrals',
+                action='Launch customer referral program'
+            ))
         
         return opportunities
 
-    def _get_operational_insights(self, feedback_df):
+    def _count_customers(self, codes, customer_count):
+        """Count distinct customers among factorized customer codes"""
+        seen = np.zeros(customer_count, dtype=bool)
+        seen[codes] = True
+        return np.count_nonzero(seen)
+
+    def _get_operational_insights(self, feedback_arrays, channel_sentiment, category_sentiment):
         """Generate operational insights from feedback data"""
         insights = []
         
         # Channel performance analysis
-        channel_sentiment = feedback_df.groupby('Feedback_Channel')['Sentiment_Score'].mean().sort_values()
-        if len(channel_sentiment) > 1:
-            worst_channel = channel_sentiment.index[0]
-            best_channel = channel_sentiment.index[-1]
-            insights.append({
-                'insight': f'Channel performance varies significantly',
-                'detail': f'{worst_channel} has lowest satisfaction ({channel_sentiment.iloc[0]:.2f}), {best_channel} has highest ({channel_sentiment.iloc[-1]:.2f})',
-                'recommendation': f'Investigate and improve {worst_channel} experience'
-            })
+        channel_means = channel_sentiment.to_numpy()
+        if len(channel_means) > 1:
+            # Ties resolve as the earlier stable sort did: first minimum, last maximum
+            worst = channel_means.argmin()
+            best = len(channel_means) - 1 - channel_means[::-1].argmax()
+            worst_channel = channel_sentiment.index[worst]
+            best_channel = channel_sentiment.index[best]
+            insights.append(Insight(
+                insight=f'Channel performance varies significantly',
+                detail=f'{worst_channel} has lowest satisfaction ({channel_means[worst]:.2f}), {best_channel} has highest ({channel_means[best]:.2f})',
+                recommendation=f'Investigate and improve {worst_channel} experience'
+            ))
         
         # Category analysis
-        category_sentiment = feedback_df.groupby('Category')['Sentiment_Score'].mean().sort_values()
-        if len(category_sentiment) > 0:
-            worst_category = category_sentiment.index[0]
-            insights.append({
-                'insight': f'{worst_category} is the most problematic area',
-                'detail': f'Average sentiment score: {category_sentiment.iloc[0]:.2f}',
-                'recommendation': f'Prioritize improvements in {worst_category}'
-            })
+        category_means = category_sentiment.to_numpy()
+        if len(category_means) > 0:
+            worst = category_means.argmin()
+            worst_category = category_sentiment.index[worst]
+            insights.append(Insight(
+                insight=f'{worst_category} is the most problematic area',
+                detail=f'Average sentiment score: {category_means[worst]:.2f}',
+                recommendation=f'Prioritize improvements in {worst_category}'
+            ))
         
         # Resolution effectiveness
-        resolved_sentiment = feedback_df[feedback_df['Resolved'] == True]['Sentiment_Score'].mean()
-        unresolved_sentiment = feedback_df[feedback_df['Resolved'] == False]['Sentiment_Score'].mean()
+        resolved = feedback_arrays.resolved
+        resolved_sentiment = feedback_arrays.sentiment[resolved].mean() if resolved.any() else np.nan
+        unresolved_sentiment = feedback_arrays.sentiment[~resolved].mean() if not resolved.all() else np.nan
         
-        insights.append({
-            'insight': 'Resolution impact on sentiment',
-            'detail': f'Resolved issues: {resolved_sentiment:.2f} avg sentiment, Unresolved: {unresolved_sentiment:.2f}',
-            'recommendation': 'Focus on improving resolution rates and quality'
-        })
+        insights.append(Insight(
+            insight='Resolution impact on sentiment',
+            detail=f'Resolved issues: {resolved_sentiment:.2f} avg sentiment, Unresolved: {unresolved_sentiment:.2f}',
+            recommendation='Focus on improving resolution rates and quality'
+        ))
         
         return insights
 
-    def _get_segment_insights(self, customers_df, feedback_df):
+    def _get_segment_insights(self, segment_metrics):
         """Analyze insights by customer segment"""
         insights = []
         
-        segment_metrics = feedback_df.groupby('Segment').agg({
-            'Sentiment_Score': 'mean',
-            'Churn_Risk': lambda x: (x == 'High').sum(),
-            'Response_Time_Hours': 'mean'
-        }).round(2)
-        
-        for segment in segment_metrics.index:
-            metrics = segment_metrics.loc[segment]
-            insights.append({
-                'segment': segment,
-                'avg_sentiment': metrics['Sentiment_Score'],
-                'high_risk_count': int(metrics['Churn_Risk']),
-                'avg_response_time': metrics['Response_Time_Hours'],
-                'recommendation': self._get_segment_recommendation(segment, metrics)
-            })
+        # itertuples yields Python floats; np.round keeps NumPy rounding for ties
+        for row in segment_metrics.itertuples():
+            avg_sentiment = np.round(row.Sentiment_Score, 2)
+            high_risk_count = int(row.high_risk_count)
+            avg_response_time = np.round(row.Response_Time_Hours, 2)
+            key = self._get_recommendation_key(avg_sentiment, high_risk_count, avg_response_time)
+            insights.append(SegmentInsight(
+                segment=row.Index,
+                avg_sentiment=avg_sentiment,
+                high_risk_count=high_risk_count,
+                avg_response_time=avg_response_time,
+                recommendation=self._SEGMENT_TEMPLATES[key].format(row.Index)
+            ))
         
         return insights
 
-    def _get_regional_insights(self, customers_df, feedback_df):
+    def _get_regional_insights(self, regional_metrics):
         """Analyze insights by region"""
         insights = []
         
-        regional_metrics = feedback_df.groupby('Region').agg({
-            'Sentiment_Score': 'mean',
-            'Churn_Risk': lambda x: (x == 'High').sum(),
-            'Response_Time_Hours': 'mean'
-        }).round(2)
-        
-        for region in regional_metrics.index:
-            metrics = regional_metrics.loc[region]
-            insights.append({
-                'region': region,
-                'avg_sentiment': metrics['Sentiment_Score'],
-                'high_risk_count': int(metrics['Churn_Risk']),
-                'avg_response_time': metrics['Response_Time_Hours'],
-                'recommendation': self._get_regional_recommendation(region, metrics)
-            })
+        # itertuples yields Python floats; np.round keeps NumPy rounding for ties
+        for row in regional_metrics.itertuples():
+            avg_sentiment = np.round(row.Sentiment_Score, 2)
+            high_risk_count = int(row.high_risk_count)
+            avg_response_time = np.round(row.Response_Time_Hours, 2)
+            key = self._get_recommendation_key(avg_sentiment, high_risk_count, avg_response_time)
+            insights.append(RegionalInsight(
+                region=row.Index,
+                avg_sentiment=avg_sentiment,
+                high_risk_count=high_risk_count,
+                avg_response_time=avg_response_time,
+                recommendation=self._REGIONAL_TEMPLATES[key].format(row.Index)
+            ))
         
         return insights
 
-    def _analyze_pain_points(self, feedback_df):
+    def _group_feedback_metrics(self, feedback_df, feedback_arrays, column):
+        """Aggregate sentiment, high-risk count and response time per group"""
+        # Built-in reducers keep the groupby on pandas' Cython kernels
+        return feedback_df[[column, 'Sentiment_Score', 'Response_Time_Hours']].assign(
+            _is_high=feedback_arrays.high_risk
+        ).groupby(column, observed=True).agg(
+            Sentiment_Score=('Sentiment_Score', 'mean'),
+            high_risk_count=('_is_high', 'sum'),
+            Response_Time_Hours=('Response_Time_Hours', 'mean')
+        )
+
+    def _analyze_pain_points(self, feedback_df, feedback_arrays):
         """Analyze common pain points from feedback text"""
+        if not feedback_arrays.negative.any():
+            return copy.deepcopy(self._EMPTY_RESULT['pain_point_analysis'])
+        
         # Extract pain points from negative feedback
-        negative_feedback = feedback_df[feedback_df['Sentiment_Score'] < -0.2]['Feedback_Text']
+        negative_feedback = feedback_df['Feedback_Text'][feedback_arrays.negative]
         
-        pain_points = []
-        for text in negative_feedback:
-            for keyword in self.pain_point_keywords:
-                if keyword in text.lower():
-                    pain_points.append(keyword)
+        pain_point_ids, matches_per_text = _match_pain_points(
+            negative_feedback, self._pain_regex, self._pain_keyword_ids
+        )
         
         # Count frequency
-        pain_point_counts = Counter(pain_points)
+        keyword_count = len(self.pain_point_keywords)
+        pain_point_counts = np.bincount(pain_point_ids, minlength=keyword_count)
+        
+        # Ties rank by first occurrence (text, then keyword order), as Counter.most_common did
+        rows = np.repeat(np.arange(matches_per_text.size), matches_per_text)
+        first_seen = np.full(keyword_count, np.iinfo(np.intp).max)
+        np.minimum.at(first_seen, pain_point_ids, rows * keyword_count + pain_point_ids)
+        present = np.flatnonzero(pain_point_counts)
+        ranked = present[np.lexsort((first_seen[present], -pain_point_counts[present]))]
+        top_pain_points = [(self.pain_point_keywords[i], int(pain_point_counts[i])) for i in ranked[:10]]
         
         analysis = {
             'top_pain_points': [
-                {'pain_point': point, 'frequency': count} 
-                for point, count in pain_point_counts.most_common(10)
+                PainPoint(pain_point=point, frequency=count)
+                for point, count in top_pain_points
             ],
-            'total_pain_points': len(pain_points),
-            'unique_pain_points': len(pain_point_counts),
-            'recommendations': self._get_pain_point_recommendations(pain_point_counts)
+            'total_pain_points': pain_point_ids.size,
+            'unique_pain_points': present.size,
+            'recommendations': self._get_pain_point_recommendations(top_pain_points)
         }
         
         return analysis
 
-    def _calculate_success_metrics(self, customers_df, deals_df, feedback_df):
+    def _calculate_success_metrics(self, feedback_df, feedback_arrays, deal_arrays):
         """Calculate key success metrics"""
+        # Rates come from integer counts over the shared masks, one reduction per array
+        feedback_volume = len(feedback_df)
+        low_risk_count = np.count_nonzero(self._category_mask(feedback_df['Churn_Risk'], ['Low']))
+        deal_count = deal_arrays.deal_size.size
+        stage_counts = np.bincount(deal_arrays.stage_codes[deal_arrays.stage_codes >= 0],
+                                   minlength=len(deal_arrays.stage_categories))
+        won_code = deal_arrays.stage_categories.get_indexer(['Closed Won'])[0]
+        won_count = stage_counts[won_code] if won_code >= 0 else 0
+        open_stages = self._stage_mask(deal_arrays, ['Prospecting', 'Qualification', 'Proposal', 'Negotiation'])
+        
         metrics = {
             'customer_satisfaction': {
-                'avg_sentiment': round(feedback_df['Sentiment_Score'].mean(), 3),
-                'positive_sentiment_rate': round((feedback_df['Sentiment_Score'] > 0.2).mean() * 100, 1),
-                'negative_sentiment_rate': round((feedback_df['Sentiment_Score'] < -0.2).mean() * 100, 1)
+                'avg_sentiment': self._mean(feedback_arrays.sentiment, 3),
+                'positive_sentiment_rate': self._rate(np.count_nonzero(feedback_arrays.sentiment > 0.2), feedback_volume),
+                'negative_sentiment_rate': self._rate(np.count_nonzero(feedback_arrays.negative), feedback_volume)
             },
             'churn_metrics': {
-                'high_risk_rate': round((feedback_df['Churn_Risk'] == 'High').mean() * 100, 1),
-                'low_risk_rate': round((feedback_df['Churn_Risk'] == 'Low').mean() * 100, 1)
+                'high_risk_rate': self._rate(np.count_nonzero(feedback_arrays.high_risk), feedback_volume),
+                'low_risk_rate': self._rate(low_risk_count, feedback_volume)
             },
             'operational_metrics': {
-                'avg_response_time': round(feedback_df['Response_Time_Hours'].mean(), 1),
-                'resolution_rate': round(feedback_df['Resolved'].mean() * 100, 1),
-                'feedback_volume': len(feedback_df)
+                'avg_response_time': self._mean(feedback_arrays.response_time, 1),
+                'resolution_rate': self._rate(np.count_nonzero(feedback_arrays.resolved), feedback_volume),
+                'feedback_volume': feedback_volume
             },
             'sales_metrics': {
-                'total_pipeline': round(deals_df[deals_df['Stage'].isin(['Prospecting', 'Qualification', 'Proposal', 'Negotiation'])]['Deal_Size'].sum(), 0),
-                'avg_deal_size': round(deals_df['Deal_Size'].mean(), 0),
-                'win_rate': round((deals_df['Stage'] == 'Closed Won').mean() * 100, 1) if len(deals_df) > 0 else 0
+                'total_pipeline': round(deal_arrays.deal_size[open_stages].sum(), 0),
+                'avg_deal_size': self._mean(deal_arrays.deal_size, 0),
+                'win_rate': self._rate(won_count, deal_count) if deal_count > 0 else 0
             }
         }
         
         return metrics
 
-    def _get_segment_recommendation(self, segment, metrics):
-        """Get recommendation for specific segment"""
-        if metrics['Sentiment_Score'] < -0.2:
-            return f"High priority: Address satisfaction issues in {segment} segment"
-        elif metrics['Churn_Risk'] > 5:
-            return f"Focus on churn prevention for {segment} customers"
-        elif metrics['Response_Time_Hours'] > 24:
-            return f"Improve response times for {segment} segment"
-        else:
-            return f"Maintain current service levels for {segment} segment"
-
-    def _get_regional_recommendation(self, region, metrics):
-        """Get recommendation for specific region"""
-        if metrics['Sentiment_Score'] < -0.2:
-            return f"Deploy additional resources to improve {region} satisfaction"
-        elif metrics['Churn_Risk'] > 5:
-            return f"Implement retention program in {region}"
-        elif metrics['Response_Time_Hours'] > 24:
-            return f"Strengthen support coverage in {region}"
+    def _rate(self, count, total):
+        """Percentage of total rounded to one decimal, NaN when total is zero"""
+        return round(count / total * 100, 1) if total > 0 else np.nan
+
+    def _mean(self, values, decimals):
+        """Rounded mean of an array, NaN when it is empty"""
+        return round(values.mean(), decimals) if values.size > 0 else np.nan
+
+    def _get_recommendation_key(self, avg_sentiment, high_risk_count, avg_response_time):
+        """Pick the recommendation template key for a segment or region's metrics"""
+        if avg_sentiment < -0.2:
+            return 'satisfaction'
+        elif high_risk_count > 5:
+            return 'churn'
+        elif avg_response_time > 24:
+            return 'response_time'
         else:
-            return f"Leverage {region} best practices for other regions"
+            return 'maintain'
 
-    def _get_pain_point_recommendations(self, pain_point_counts):
+    def _get_pain_point_recommendations(self, top_pain_points):
         """Get recommendations based on pain point analysis"""
         recommendations = []
         
-        top_pain_points = pain_point_counts.most_common(3)
-        for pain_point, count in top_pain_points:
+        for pain_point, count in top_pain_points[:3]:
             if pain_point in ['slow', 'response']:
                 recommendations.append("Implement faster response time SLAs")
             elif pain_point in ['expensive', 'pricing']:
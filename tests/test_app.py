@@ -0,0 +1,26 @@
+import io
+
+import pandas as pd
+
+from app import write_csv
+
+
+def test_write_csv_format():
+    """CSV downloads quote names and strings, write booleans lowercase and dates at day precision"""
+    df = pd.DataFrame({
+        'Name': ['Acme, Inc.', 'Say "hi"'],
+        'Count': [3, 40],
+        'Score': [0.25, -1.5],
+        'Resolved': [True, False],
+        'Date': pd.to_datetime(['2024-01-05', '2024-12-31']),
+        'Region': pd.Categorical(['APAC', 'Europe']),
+        'Notes': ['ok', None]
+    })
+    output = io.BytesIO()
+    write_csv(df, output)
+
+    assert output.getvalue() == (
+        b'"Name","Count","Score","Resolved","Date","Region","Notes"\n'
+        b'"Acme, Inc.",3,0.25,true,2024-01-05,"APAC","ok"\n'
+        b'"Say ""hi""",40,-1.5,false,2024-12-31,"Europe",\n'
+    )
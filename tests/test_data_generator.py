@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+import data_generator
+from data_generator import CRMDataGenerator
+
+
+def test_numba_kernel_matches_numpy_scoring(monkeypatch):
+    """The Numba kernel and the NumPy path give identical feedback scores for the same RNG stream"""
+    pytest.importorskip('numba')
+    rng = np.random.default_rng(7)
+    num_rows = 200_000
+    statuses = rng.choice(['Active', 'Inactive', 'Churned'], num_rows)
+    segments = rng.choice(['SMB', 'Mid-Market', 'Enterprise'], num_rows)
+    generator = CRMDataGenerator()
+
+    monkeypatch.setattr(data_generator, 'NUMBA_MIN_ROWS', 0)
+    generator.rng = np.random.default_rng(1)
+    kernel_results = generator._score_feedback(statuses, segments)
+
+    monkeypatch.setattr(data_generator, 'NUMBA_MIN_ROWS', num_rows + 1)
+    generator.rng = np.random.default_rng(1)
+    numpy_results = generator._score_feedback(statuses, segments)
+
+    for kernel_values, numpy_values in zip(kernel_results, numpy_results):
+        assert np.array_equal(kernel_values, numpy_values)